@@ -0,0 +1,57 @@
+"""Logging and environment setup shared by the API and the worker."""
+from __future__ import annotations
+import logging
+import os
+import sys
+from dotenv import load_dotenv
+from typing import Final
+
+# Load environment variables first so .env.local can set LOG_LEVEL and GOVI_DEBUG
+load_dotenv(dotenv_path=".env.local")
+
+# Setup logging; Render's log collector already timestamps each line.
+# LOG_LEVEL applies to both the API and the worker.
+_log_level = os.getenv("LOG_LEVEL", "INFO").upper()
+_log_level_valid = isinstance(logging.getLevelName(_log_level), int)
+logging.basicConfig(
+    level=_log_level if _log_level_valid else logging.INFO,
+    format="%(levelname)s %(name)s %(message)s",
+    force=True,
+)
+logger = logging.getLogger("govi-agent")
+if not _log_level_valid:
+    logger.warning("Invalid LOG_LEVEL %r, using INFO", _log_level)
+if os.getenv("GOVI_DEBUG"):
+    logger.setLevel(logging.DEBUG)
+else:
+    # Keep per-frame plugin chatter out of the realtime path
+    for noisy in ("livekit", "openai"):
+        logging.getLogger(noisy).setLevel(logging.WARNING)
+
+REQUIRED_VARS = (
+    "LIVEKIT_URL",
+    "LIVEKIT_API_KEY",
+    "LIVEKIT_API_SECRET",
+    "OPENAI_API_KEY"
+)
+
+# Values read once after load_dotenv; empty when unset (check_environment reports those)
+LIVEKIT_URL: Final[str] = os.environ.get("LIVEKIT_URL", "")
+LIVEKIT_API_KEY: Final[str] = os.environ.get("LIVEKIT_API_KEY", "")
+LIVEKIT_API_SECRET: Final[str] = os.environ.get("LIVEKIT_API_SECRET", "")
+OPENAI_API_KEY: Final[str] = os.environ.get("OPENAI_API_KEY", "")
+
+# Snapshot which required variables are set; the environment doesn't change after load_dotenv
+ENV_PRESENT: Final[dict[str, bool]] = {var: bool(os.environ.get(var)) for var in REQUIRED_VARS}
+ENV_READY: Final[bool] = all(ENV_PRESENT.values())
+
+def check_environment():
+    """Check required environment variables are set."""
+    missing = [var for var, present in ENV_PRESENT.items() if not present]
+    logger.info(
+        "env: %d/%d present, missing=%s",
+        len(REQUIRED_VARS) - len(missing), len(REQUIRED_VARS), missing
+    )
+    if not ENV_READY:
+        logger.error("Missing required environment variables: %s", missing)
+        sys.exit(1)
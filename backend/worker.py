@@ -0,0 +1,240 @@
+"""LiveKit worker process for the Govi agent.
+
+Runs separately from the API in agent.py so realtime audio never shares an
+event loop with HTTP traffic:
+
+    python worker.py
+"""
+from __future__ import annotations
+import asyncio
+import gc
+import random
+import re
+import signal
+import textwrap
+from pathlib import Path
+from typing import Final
+
+from livekit import rtc
+from livekit.agents import (
+    AutoSubscribe,
+    JobContext,
+    JobRequest,
+    Worker,
+    WorkerOptions,
+    llm,
+    WorkerType,
+    WorkerPermissions
+)
+from livekit.agents.multimodal import MultimodalAgent
+from livekit.plugins import openai
+
+from config import (
+    LIVEKIT_API_KEY,
+    LIVEKIT_API_SECRET,
+    LIVEKIT_URL,
+    OPENAI_API_KEY,
+    check_environment,
+    logger,
+)
+
+# Use uvloop for the worker and, since they re-import this module, its job processes;
+# it isn't available on Windows, where the default loop is used
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+if uvloop is not None:
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+def _load_prompt(path: Path) -> str:
+    """Read a prompt file, dropping indentation and extra blank lines that only cost tokens."""
+    text = textwrap.dedent(path.read_text(encoding="utf-8")).strip()
+    return re.sub(r"\n{3,}", "\n\n", text)
+
+# System prompt for the realtime model, loaded once at import
+GOVI_INSTRUCTIONS: Final[str] = _load_prompt(Path(__file__).parent / "prompts" / "govi_es.txt")
+
+# Server-side VAD settings shared by every realtime session
+_VAD_OPTS = openai.realtime.ServerVadOptions(
+    threshold=0.6,
+    prefix_padding_ms=200,
+    silence_duration_ms=500,
+    create_response=True
+)
+
+# RealtimeModel settings; identical for every session
+_MODEL_KWARGS: Final[dict] = dict(
+    instructions=GOVI_INSTRUCTIONS,
+    voice="sage",
+    temperature=0.6,
+    model="gpt-4o-mini-realtime-preview",
+    turn_detection=_VAD_OPTS,
+)
+
+# Opening message Govi speaks when a participant joins
+_INITIAL_GREETING = llm.ChatMessage(
+    role="assistant",
+    content="¡Hola! Soy Govi, tu asistente del GovLab. ¿En qué puedo ayudarte hoy?",
+)
+
+async def request_handler(req: JobRequest):
+    """Handle incoming job requests."""
+    logger.info("Received job request for room: %s", req.room)
+    await req.accept(
+        name="govi",
+        identity=f"govi-{req.job_id}",
+        attributes={"agent_type": "govlab_assistant"}
+    )
+
+def _on_disconnected():
+    """Log when the agent loses its room connection."""
+    logger.warning("Room disconnected")
+
+def _on_reconnected():
+    """Log when the agent's room connection is restored."""
+    logger.info("Room reconnected")
+
+async def entrypoint(ctx: JobContext):
+    """Worker entrypoint that handles LiveKit connection."""
+    try:
+        logger.info("Connecting to room %s", ctx.room.name)
+        await ctx.connect(auto_subscribe=AutoSubscribe.AUDIO_ONLY)
+        logger.info("Successfully connected to room")
+        
+        # Add connection status monitoring
+        ctx.room.on("disconnected", _on_disconnected)
+        ctx.room.on("reconnected", _on_reconnected)
+        
+        # Build the model before the participant joins; it doesn't depend on them
+        model = build_realtime_model()
+
+        # Wait for participant and start agent
+        participant = await ctx.wait_for_participant()
+        run_multimodal_agent(ctx, participant, model)
+        
+    except Exception as e:
+        logger.error("Worker failed: %s", e, exc_info=True)
+        raise
+
+def build_realtime_model() -> openai.realtime.RealtimeModel:
+    """Build the OpenAI realtime model used by the agent."""
+    if not OPENAI_API_KEY:
+        raise ValueError("OPENAI_API_KEY not set")
+        
+    logger.info("Initializing realtime model")
+    model = openai.realtime.RealtimeModel(**_MODEL_KWARGS)
+    logger.info("RealtimeModel initialized successfully")
+    return model
+
+def run_multimodal_agent(
+    ctx: JobContext,
+    participant: rtc.RemoteParticipant,
+    model: openai.realtime.RealtimeModel,
+):
+    """Initialize and run the multimodal agent"""
+    try:
+        logger.info("Initializing multimodal agent")
+        agent = MultimodalAgent(model=model)
+        agent.start(ctx.room, participant)
+        logger.info("MultimodalAgent started successfully")
+
+        session = model.sessions[0]
+        session.conversation.item.create(_INITIAL_GREETING)
+        session.response.create()
+        logger.info("Initial conversation created")
+        
+    except Exception as e:
+        logger.error("Error in run_multimodal_agent: %s", e, exc_info=True)
+        # Attempt cleanup if agent exists
+        if 'agent' in locals():
+            try:
+                agent.stop()
+            except Exception as cleanup_error:
+                logger.error("Error during cleanup: %s", cleanup_error)
+        raise
+
+# LiveKit worker options, built once at import
+WORKER_OPTS = WorkerOptions(
+    entrypoint_fnc=entrypoint,
+    ws_url=LIVEKIT_URL,
+    api_key=LIVEKIT_API_KEY,
+    api_secret=LIVEKIT_API_SECRET,
+    request_fnc=request_handler,
+    agent_name="govi",
+    worker_type=WorkerType.ROOM,
+    permissions=WorkerPermissions(
+        can_publish=True,
+        can_subscribe=True,
+        hidden=False
+    )
+)
+
+async def run_supervised(max_delay: float = 60.0):
+    """Run the worker, restarting it with jittered exponential backoff if it fails."""
+    main_task = asyncio.current_task()
+    loop = asyncio.get_running_loop()
+    shutdown = asyncio.Event()
+
+    def _on_signal():
+        # First signal drains active calls like cli.run_app does; a second one stops now
+        if shutdown.is_set():
+            main_task.cancel()
+        shutdown.set()
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, _on_signal)
+
+    delay = 1.0
+    try:
+        while not shutdown.is_set():
+            worker = Worker(WORKER_OPTS, devmode=False)
+            started = loop.time()
+            run = asyncio.create_task(worker.run())
+            stop = asyncio.create_task(shutdown.wait())
+            await asyncio.wait({run, stop}, return_when=asyncio.FIRST_COMPLETED)
+            stop.cancel()
+
+            if shutdown.is_set():
+                logger.info("Draining LiveKit worker; signal again to stop immediately")
+                try:
+                    if not run.done():
+                        await worker.drain(timeout=WORKER_OPTS.drain_timeout)
+                finally:
+                    await worker.aclose()
+                    await asyncio.gather(run, return_exceptions=True)
+                break
+
+            # run() returns only once the worker is closed; failures raise out of it
+            await worker.aclose()
+            error = run.exception()
+            if error is None:
+                break
+
+            # A long healthy run means this is a fresh failure, not a crash loop
+            if loop.time() - started > max_delay:
+                delay = 1.0
+            sleep_for = delay + random.uniform(0, delay / 2)
+            logger.error(
+                "LiveKit worker failed, restarting in %.1fs", sleep_for, exc_info=error
+            )
+            try:
+                await asyncio.wait_for(shutdown.wait(), timeout=sleep_for)
+            except asyncio.TimeoutError:
+                pass
+            delay = min(delay * 2, max_delay)
+    except asyncio.CancelledError:
+        logger.warning("LiveKit worker stopped without finishing the drain")
+        return
+    logger.info("LiveKit worker shut down")
+
+if __name__ == "__main__":
+    # Check environment variables first
+    check_environment()
+
+    # Long-lived import-time objects (prompt, worker options) never die, so stop
+    # full collections from rescanning them
+    gc.freeze()
+
+    # Run the worker
+    asyncio.run(run_supervised())